@@ -1,57 +1,59 @@
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Final
+from urllib.parse import quote
 
-import bs4
+from lxml import etree, html
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 from calibre.ebooks.metadata.book.base import Metadata
 from calibre.ebooks.metadata.sources.base import Source, Option
-from calibre.utils.date import strptime
-
-
-def remove_empty_strings(items):
-    """
-    @param items: Iterable[str]
-    @return: tuple[str]
-    """
-    return tuple(filter(lambda item: item, items))
-
-
-def filter_not_include(items, keywords):
-    """
-    @param items: Iterable[str]
-    @param keywords: Iterable[str]
-    @return: tuple[str]
-    """
-    return tuple(filter(lambda item: all(keyword not in item for keyword in keywords), items))
-
-
-def remove_keywords_in_string(item, keywords):
-    """
-    @param item: str
-    @param keywords: Iterable[str]
-    @return: str
-    """
-    for keyword in keywords:
-        item = item.replace(keyword, "")
-
-    return item
-
-
-def remove_keywords_in_strings(items, keywords):
-    """
-    @param items: Iterable[str]
-    @param keywords: Iterable[str]
-    @return: Iterable[str]
-    """
-    return tuple(map(lambda item: remove_keywords_in_string(item=item, keywords=keywords), items))
 
-
-def trim_whitespaces_in_strings(items):
-    """
-    @param items: Iterable[str]
-    @return: Iterable[str]
-    """
-    return tuple(map(lambda item: item.strip(), items))
+try:
+    from ._fastpath import (
+        filter_not_include,
+        remove_empty_strings,
+        remove_keywords_in_string,
+        remove_keywords_in_strings,
+        trim_whitespaces_in_strings
+    )
+except ImportError:
+    from _fastpath import (
+        filter_not_include,
+        remove_empty_strings,
+        remove_keywords_in_string,
+        remove_keywords_in_strings,
+        trim_whitespaces_in_strings
+    )
+
+_AUTHOR_SPLIT_RE = re.compile(pattern='[/,;]')
+_TAG_SPLIT_RE = re.compile(pattern='[,;]')
+_AUTHOR_EXCLUDE = ("옮김", "엮은이", "역자")
+_AUTHOR_STRIP = ("지은이", "저자", "작가", "지음")
+_TAG_STRIP = ("TAG",)
+
+_COLON_TRANS = str.maketrans('', '', ':')
+
+_AUTHOR_REJECT_RE = re.compile(pattern='|'.join(map(re.escape, _AUTHOR_EXCLUDE)))
+_AUTHOR_STRIP_RE = re.compile(pattern='|'.join(map(re.escape, _AUTHOR_STRIP)))
+_TAG_STRIP_RE = re.compile(pattern='|'.join(map(re.escape, _TAG_STRIP)))
+_TITLE_URL_RE = re.compile(pattern=rb'"TITLE_URL"\s*:\s*"([^"]+)"')
+
+_BOOK_INFO_LI_XPATH = etree.XPath(
+    '//*[@id="contents"]/div'
+    '/div[contains(@class, "resultViewDetail")]'
+    '/div[contains(@class, "resultBookInfo")]'
+    '/div[contains(@class, "bookDataWrap")]/ul/li'
+)
+_STRONG_XPATH = etree.XPath('.//strong')
+_DIV_XPATH = etree.XPath('.//div')
+_VIEW_INFO_XPATH = etree.XPath('//*[contains(@class, "searchViewInfo")]')
 
 
 def get_isbn(identifiers):
@@ -62,7 +64,7 @@ def get_isbn(identifiers):
     if identifiers is None or identifiers.get("isbn") is None:
         return None
 
-    return re.split(pattern='[( ]', string=identifiers.get("isbn"))[0]
+    return identifiers.get("isbn").split(' ', 1)[0].split('(', 1)[0]
 
 
 def get_book_query(isbn):
@@ -70,7 +72,7 @@ def get_book_query(isbn):
     @param isbn: str
     @return: str
     """
-    return '&'.join(('='.join(("schM", "intgr_detail_view_isbn")), '='.join(("isbn", isbn))))
+    return f"schM=intgr_detail_view_isbn&isbn={quote(string=isbn)}"
 
 
 class NationalLibraryOfKoreaMetadataPlugin(Source):
@@ -80,8 +82,8 @@ class NationalLibraryOfKoreaMetadataPlugin(Source):
     minimum_calibre_version: tuple[int, int, int] = (7, 0, 0)
     description: str = "National Library of Korea Metadata Plugin"
     supported_platforms: list[str] = ["windows", "osx", "linux"]
-    capabilities: frozenset[str] = frozenset(("identify", "cover"))
-    touched_fields: frozenset[str] = frozenset((
+    capabilities: Final[frozenset[str]] = frozenset({"identify", "cover"})
+    touched_fields: Final[frozenset[str]] = frozenset({
         "title",
         "authors",
         "identifier:doi",
@@ -93,7 +95,7 @@ class NationalLibraryOfKoreaMetadataPlugin(Source):
         "languages",
         "comments",
         "tags"
-    ))
+    })
     options: tuple[Option] = (Option(name="api_key", type_="string", default=None, label="api_key", desc="api_key"),)
     prefer_results_with_isbn: bool = True
     ignore_ssl_errors: bool = True
@@ -119,25 +121,40 @@ class NationalLibraryOfKoreaMetadataPlugin(Source):
             identifiers = {}
         log.info(f"identify - start. title={title}, authors={authors}, identifiers={identifiers}")
 
+        isbn = get_isbn(identifiers=identifiers)
+        if isbn is None:
+            log.warn(f"identify - no isbn. identifiers={identifiers}")
+            return
+
         try:
-            book_json_url: str = self.get_book_json_url(identifiers=identifiers)[2]
+            book_json_url: str = f"https://www.nl.go.kr/seoji/SearchApi.do?{self.get_book_json_query(isbn=isbn)}"
             log.debug(book_json_url)
 
-            book_json = self.get_book_json(url=book_json_url, timeout=timeout)
+            book_url = f"https://nl.go.kr/seoji/contents/S80100000000.do?{get_book_query(isbn=isbn)}"
+            log.debug(book_url)
+
+            executor = self.get_executor()
+            book_json_future = executor.submit(self.get_book_json, url=book_json_url, timeout=timeout)
+            book_info_future = executor.submit(self.get_book_info, url=book_url, timeout=timeout)
+
+            book_json = book_json_future.result()
             log.debug(book_json)
 
             title = book_json.get("TITLE")
-            if book_json.get("AUTHOR"):
-                authors = remove_empty_strings(
-                    items=trim_whitespaces_in_strings(
-                        items=remove_keywords_in_strings(
-                            items=filter_not_include(
-                                items=re.split(pattern='[/,;]', string=book_json.get("AUTHOR")),
-                                keywords=("옮김", "엮은이", "역자")
-                            ),
-                            keywords=("지은이", ":", "저자", "작가", "지음")
-                        )
+            if not title:
+                log.warn(f"identify - no TITLE. identifiers={identifiers}")
+                return
+
+            author = book_json.get("AUTHOR")
+            if author:
+                authors = tuple(
+                    stripped
+                    for stripped in (
+                        _AUTHOR_STRIP_RE.sub(repl="", string=item).strip()
+                        for item in _AUTHOR_SPLIT_RE.split(string=author.translate(_COLON_TRANS))
+                        if not _AUTHOR_REJECT_RE.search(string=item)
                     )
+                    if stripped
                 )
             else:
                 authors = None
@@ -146,9 +163,9 @@ class NationalLibraryOfKoreaMetadataPlugin(Source):
             mi.publisher = book_json.get("PUBLISHER")
 
             try:
-                if book_json.get("REAL_PUBLISH_DATE") or book_json.get("PUBLISH_PREDATE"):
-                    pubdate = book_json.get("REAL_PUBLISH_DATE") or book_json.get("PUBLISH_PREDATE")
-                    mi.pubdate = strptime(val=pubdate, fmt="%Y%m%d")
+                pubdate = book_json.get("REAL_PUBLISH_DATE") or book_json.get("PUBLISH_PREDATE")
+                if pubdate:
+                    mi.pubdate = datetime(int(pubdate[0:4]), int(pubdate[4:6]), int(pubdate[6:8]))
             except Exception as e:
                 log.exception(e)
 
@@ -159,22 +176,17 @@ class NationalLibraryOfKoreaMetadataPlugin(Source):
             mi.set_identifier(typ="isbn_add_code", val=book_json.get("EA_ADD_CODE"))
 
             try:
-                book_url = self.get_book_url(identifiers=identifiers)
-                log.debug(book_url)
-
-                if book_url is None:
-                    raise "book_url is None"
-
-                book_info = self.get_book_info(url=book_url[2], timeout=timeout)
+                book_info = book_info_future.result()
                 log.debug(book_info)
 
                 try:
-                    if book_info.get("키워드"):
+                    keywords = book_info.get("키워드")
+                    if keywords:
                         mi.tags = remove_empty_strings(
                             items=trim_whitespaces_in_strings(
                                 items=remove_keywords_in_strings(
-                                    items=re.split(pattern='[,;]', string=book_info.get("키워드")),
-                                    keywords=("TAG", ":")
+                                    items=_TAG_SPLIT_RE.split(string=keywords.translate(_COLON_TRANS)),
+                                    pattern=_TAG_STRIP_RE
                                 )
                             )
                         )
@@ -182,22 +194,23 @@ class NationalLibraryOfKoreaMetadataPlugin(Source):
                     log.exception(e)
 
                 try:
-                    if book_info.get("DOI"):
-                        mi.set_identifier(typ="doi", val=book_info.get("DOI").lstrip("https://doi.org/"))
+                    doi = book_info.get("DOI")
+                    if doi:
+                        mi.set_identifier(typ="doi", val=doi.removeprefix("https://doi.org/"))
                 except Exception as e:
                     log.exception(e)
 
                 try:
-                    if book_info.get("형태 및 본문언어") or book_info.get("서비스형태 및 본문언어"):
-                        mi.languages = (
-                            (book_info.get("형태 및 본문언어") or book_info.get("서비스형태 및 본문언어")).split('/')[-1].strip(),
-                        )
+                    language = book_info.get("형태 및 본문언어") or book_info.get("서비스형태 및 본문언어")
+                    if language:
+                        mi.languages = (language.rpartition('/')[2].strip(),)
                 except Exception as e:
                     log.exception(e)
 
                 try:
-                    if book_info.get("comments"):
-                        mi.comments = book_info.get("comments")
+                    comments = book_info.get("comments")
+                    if comments:
+                        mi.comments = comments
                 except Exception as e:
                     log.exception(e)
             except Exception as e:
@@ -237,10 +250,27 @@ class NationalLibraryOfKoreaMetadataPlugin(Source):
         book_url = self.get_book_json_url(identifiers=identifiers)[2]
         log.debug(book_url)
 
-        book_json = self.get_book_json(url=book_url, timeout=timeout)
-        log.debug(book_json)
+        book_json = getattr(self, "_book_json_cache", {}).get(book_url)
+        if book_json is not None:
+            title_url = book_json.get("TITLE_URL")
+        else:
+            contents = self.download_contents(url=book_url, timeout=timeout)
+            match = _TITLE_URL_RE.search(string=contents)
+            title_url = match.group(1).decode() if match else None
+        log.debug(title_url)
+
+        if title_url:
+            self.download_image(url=title_url, timeout=timeout, log=log, result_queue=result_queue)
+
+    def get_executor(self):
+        """
+        @return: ThreadPoolExecutor
+        """
+        executor = getattr(self, "_executor", None)
+        if executor is None:
+            executor = self._executor = ThreadPoolExecutor(max_workers=2)
 
-        self.download_image(url=book_json.get("TITLE_URL"), timeout=timeout, log=log, result_queue=result_queue)
+        return executor
 
     def download_contents(self, url, timeout):
         """
@@ -256,15 +286,17 @@ class NationalLibraryOfKoreaMetadataPlugin(Source):
         @type timeout: int
         @return dict[str, str]
         """
-        contents = self.download_contents(url=url, timeout=timeout).decode()
-        root = bs4.BeautifulSoup(markup=contents, features="html.parser")
-        lis = root.select(
-            selector="#contents > div > div.resultViewDetail > div.resultBookInfo > div.bookDataWrap > ul > li"
-        )
-
-        data = {li.select_one(selector="strong").text.strip(): li.select_one(selector="div").text.strip() for li in lis}
-        if "책소개" in root.text and root.select_one(".searchViewInfo"):
-            data["comments"] = root.select_one(".searchViewInfo").decode()
+        contents = self.download_contents(url=url, timeout=timeout)
+        root = html.fromstring(contents)
+        lis = _BOOK_INFO_LI_XPATH(root)
+
+        data = {
+            _STRONG_XPATH(li)[0].text_content().strip(): _DIV_XPATH(li)[0].text_content().strip()
+            for li in lis
+        }
+        view_infos = _VIEW_INFO_XPATH(root)
+        if view_infos and "책소개" in root.text_content():
+            data["comments"] = etree.tostring(view_infos[0], encoding="unicode")
 
         return data
 
@@ -297,13 +329,7 @@ class NationalLibraryOfKoreaMetadataPlugin(Source):
         @param isbn: str
         @return: str
         """
-        return '&'.join((
-            '='.join(("cert_key", self.prefs.get('api_key'))),
-            '='.join(("result_style", "json")),
-            '='.join(("page_no", '1')),
-            '='.join(("page_size", '1')),
-            '='.join(("isbn", isbn))
-        ))
+        return f"cert_key={self.prefs.get('api_key')}&result_style=json&page_no=1&page_size=1&isbn={quote(string=isbn)}"
 
     def get_book_json(self, url, timeout):
         """
@@ -311,6 +337,22 @@ class NationalLibraryOfKoreaMetadataPlugin(Source):
         @param timeout: int
         @return: dict[str, str]
         """
-        contents = self.download_contents(url=url, timeout=timeout).decode()
+        cache = getattr(self, "_book_json_cache", None)
+        if cache is None:
+            cache = self._book_json_cache = {}
+
+        book_json = cache.get(url)
+        if book_json is not None:
+            return book_json
+
+        contents = self.download_contents(url=url, timeout=timeout)
+        if ijson is not None:
+            book_json = next(ijson.items(contents, "docs.item"))
+        else:
+            book_json = json.loads(contents).get("docs")[0]
+
+        if len(cache) >= 128:
+            cache.clear()
+        cache[url] = book_json
 
-        return json.loads(contents).get("docs")[0]
+        return book_json
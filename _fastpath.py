@@ -0,0 +1,61 @@
+"""
+Hot string-cleanup helpers.
+
+Kept in a standalone module with full type annotations so it can be
+ahead-of-time compiled with mypyc or Cython; a compiled extension built
+from this file shadows the pure-Python version automatically, and the
+plugin falls back to this source when no extension is shipped.
+"""
+import re
+from collections.abc import Iterable
+
+
+def remove_empty_strings(items: Iterable[str]) -> tuple[str, ...]:
+    """
+    @param items: Iterable[str]
+    @return: tuple[str]
+    """
+    return tuple(filter(lambda item: item, items))
+
+
+def filter_not_include(items: Iterable[str], keywords: Iterable[str]) -> tuple[str, ...]:
+    """
+    @param items: Iterable[str]
+    @param keywords: Iterable[str]
+    @return: tuple[str]
+    """
+    out: list[str] = []
+    for item in items:
+        for keyword in keywords:
+            if keyword in item:
+                break
+        else:
+            out.append(item)
+
+    return tuple(out)
+
+
+def remove_keywords_in_string(item: str, pattern: re.Pattern) -> str:
+    """
+    @param item: str
+    @param pattern: re.Pattern
+    @return: str
+    """
+    return pattern.sub(repl="", string=item)
+
+
+def remove_keywords_in_strings(items: Iterable[str], pattern: re.Pattern) -> tuple[str, ...]:
+    """
+    @param items: Iterable[str]
+    @param pattern: re.Pattern
+    @return: Iterable[str]
+    """
+    return tuple(map(lambda item: remove_keywords_in_string(item=item, pattern=pattern), items))
+
+
+def trim_whitespaces_in_strings(items: Iterable[str]) -> tuple[str, ...]:
+    """
+    @param items: Iterable[str]
+    @return: Iterable[str]
+    """
+    return tuple(map(lambda item: item.strip(), items))